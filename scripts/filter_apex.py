@@ -7,11 +7,29 @@ performs the file-system operations.
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
 import json
 import logging
+import os
+import pickle
 import shutil
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
 
 logger = logging.getLogger(__name__)
 formatter = logging.Formatter(
@@ -22,15 +40,45 @@ _stream_handler = logging.StreamHandler()
 _stream_handler.setFormatter(formatter)
 if not logger.handlers:
     logger.addHandler(_stream_handler)
-logger.setLevel(logging.DEBUG)
 logger.propagate = False
 
 LICENSE_TO_KEEP = "proprietary"
 
+# Titles of the main catalogue children that are kept
+_KEEP_TOPLEVEL = frozenset({"themes", "projects"})
+
+# (project id, project title), turned into a link dict by get_theme_links
+ProjectRef = Tuple[str, str]
+
+# Parent directories already created by write_json during this run
+_MKDIR_CACHE: Set[str] = set()
+
+# Parsed JSON files persisted across runs when APEX_CACHE=1 is set. Anchored
+# to the repository root so the working directory does not matter; can be
+# overridden with APEX_CACHE_DIR.
+_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "filter_apex"
+
 
 # --- Small helpers -------------------------------------------------
 
 
+def _fast_rmtree(path: str) -> None:
+    """Recursively delete ``path`` using the cached ``os.scandir`` entry types.
+
+    Like ``shutil.rmtree``, refuses to delete through a symbolic link.
+    Links found inside the tree are unlinked, never followed.
+    """
+    if os.path.islink(path):
+        raise OSError("Cannot call rmtree on a symbolic link")
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
+
+
 def recreate_dir(path: Path) -> None:
     """Remove and recreate a directory.
 
@@ -39,55 +87,248 @@ def recreate_dir(path: Path) -> None:
     """
     logger.debug("Recreating dir: %s", path)
     if path.exists():
-        shutil.rmtree(path)
+        _fast_rmtree(str(path))
+    # Also drop entries for trees that were removed by someone else
+    _MKDIR_CACHE.clear()
     path.mkdir(parents=True, exist_ok=True)
 
 
-def load_json(path: Path) -> Dict:
-    logger.debug("Reading file %s", path)
+def _scandir_recursive(
+    source: str, dest: str, skip: frozenset = frozenset()
+) -> None:
+    """Copy the regular files of ``source`` into ``dest``.
+
+    Top-level entries whose name is in ``skip`` are not copied.
+    """
+    os.makedirs(dest, exist_ok=True)
+    with os.scandir(source) as it:
+        for entry in it:
+            if entry.name in skip:
+                continue
+            target = os.path.join(dest, entry.name)
+            if entry.is_dir():
+                _scandir_recursive(entry.path, target)
+            elif entry.is_file():
+                shutil.copyfile(entry.path, target)
+
+
+def _parse_json_file(path: str) -> Dict:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Reading file %s", path)
+    if orjson is not None:
+        with open(path, "rb") as fh:
+            return orjson.loads(fh.read())
     with open(path, "r", encoding="utf-8") as fh:
         return json.load(fh)
 
 
+def _load_json_from_disk_cache(path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a JSON file through the on-disk cache.
+
+    The cache lives in ``APEX_CACHE_DIR`` if set, else ``_CACHE_DIR``. Each
+    source file has one pickle entry holding (mtime_ns, size, data); the
+    entry is only used when both still match the source file.
+    """
+    cache_dir = Path(os.environ.get("APEX_CACHE_DIR") or _CACHE_DIR)
+    entry = cache_dir / (hashlib.sha1(path.encode("utf-8")).hexdigest() + ".pickle")
+    try:
+        with open(entry, "rb") as fh:
+            cached_mtime_ns, cached_size, data = pickle.load(fh)
+        if (cached_mtime_ns, cached_size) == (mtime_ns, size):
+            return data
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", entry, e)
+
+    data = _parse_json_file(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see
+        # a partially written entry
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump((mtime_ns, size, data), fh, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+    except OSError as e:
+        logger.warning("Could not write cache entry %s: %s", entry, e)
+    return data
+
+
+@functools.lru_cache(maxsize=512)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Dict:
+    if os.environ.get("APEX_CACHE") == "1":
+        return _load_json_from_disk_cache(path, mtime_ns, size)
+    return _parse_json_file(path)
+
+
+def load_json(path: Path) -> Dict:
+    """Load a JSON file, parsing each (path, mtime, size) only once per run.
+
+    With ``APEX_CACHE=1`` parsed files are also cached on disk across runs.
+    A shallow copy is returned: callers may set or replace top-level keys,
+    but must not mutate nested values in place as they are shared with
+    the cache.
+    """
+    path_str = str(path.resolve())
+    st = os.stat(path_str)
+    return dict(_load_json_cached(path_str, st.st_mtime_ns, st.st_size))
+
+
+def iter_catalog_links(path: Path, header: Dict) -> Iterator[Dict]:
+    """Yield the links of a catalog one at a time.
+
+    The remaining top-level keys are stored in ``header`` once the
+    iterator is exhausted; its "links" value is a placeholder the caller
+    is expected to replace. Uses ijson to stream the file when it is
+    installed, otherwise the whole file is loaded.
+    """
+    if ijson is None:
+        header.update(load_json(path))
+        yield from header.get("links", [])
+        return
+
+    logger.debug("Streaming file %s", path)
+    header_builder = ijson.ObjectBuilder()
+    link_builder = None
+    with open(path, "rb") as fh:
+        for prefix, event, value in ijson.parse(fh, use_float=True):
+            if prefix == "links.item" and event == "start_map":
+                link_builder = ijson.ObjectBuilder()
+            if link_builder is not None:
+                link_builder.event(event, value)
+                if prefix == "links.item" and event == "end_map":
+                    yield link_builder.value
+                    link_builder = None
+            elif prefix == "links" or prefix.startswith("links."):
+                continue
+            elif prefix == "" and event == "map_key" and value == "links":
+                # Keep the key position, the links themselves are yielded
+                header_builder.event(event, value)
+                header_builder.event("null", None)
+            else:
+                header_builder.event(event, value)
+    header.update(header_builder.value)
+
+
+def _ensure_parent(path: Path) -> None:
+    parent = str(path.parent)
+    if parent not in _MKDIR_CACHE:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _MKDIR_CACHE.add(parent)
+
+
+def _write_with_parent(path: Path, write: Callable[[], None]) -> None:
+    """Run ``write`` once the parent of ``path`` exists."""
+    _ensure_parent(path)
+    try:
+        write()
+    except FileNotFoundError:
+        # The parent was removed outside recreate_dir, the cache entry is stale
+        _MKDIR_CACHE.discard(str(path.parent))
+        _ensure_parent(path)
+        write()
+
+
+def copy_file(source: Path, dest: Path) -> None:
+    """Copy ``source`` to ``dest`` byte for byte.
+
+    A real copy rather than a hard link, so later writes to the target
+    tree can never change the source tree.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Copying file %s", dest)
+    _write_with_parent(dest, lambda: shutil.copyfile(source, dest))
+
+
 def write_json(path: Path, data: Dict) -> None:
-    logger.debug("Writing file %s", path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Writing file %s", path)
+    # Both backends give the same layout and UTF-8 strings, but they are not
+    # byte-identical: floats in exponent form differ (stdlib 1e-05 / 1e+16,
+    # orjson 0.00001 / 1e16) and orjson rejects integers beyond 64 bits.
+    if orjson is not None:
+        buf = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        buf = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    _write_with_parent(path, lambda: path.write_bytes(buf))
 
 
 # --- Core ----------------------------------
 
 
-def write_project_collection(dest: Path, project: Dict) -> None:
-    """Write a project's collection.json filtering out experiment/workflow links."""
-    filtered_links = [
-        link
-        for link in project.get("links", [])
-        if "title" not in link
-        or (
-            "experiment: " not in link["title"].lower()
-            and "workflow: " not in link["title"].lower()
-            and "/products/" not in link["href"].lower()
-        )
-    ]
-    project = dict(project)  # shallow copy to avoid mutating caller's data
-    project["links"] = filtered_links
-    write_json(dest, project)
+def _scan_project_links(links: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """Classify a project's links in a single pass.
+
+    Returns the links to keep (dropping experiment, workflow and product
+    links) and the ids of the themes the project references.
+    """
+    filtered_links: List[Dict] = []
+    theme_ids: List[str] = []
+    for link in links:
+        title = link.get("title")
+        if title is None:
+            filtered_links.append(link)
+            continue
+        # Only the prefix matters, so avoid lower-casing the whole title
+        prefix = title[:12].lower()
+        href = link["href"]
+        if prefix.startswith("theme: "):
+            idx = href.find("/themes/")
+            if idx >= 0:
+                rest = href[idx + 8 :]
+                end = rest.find("/")
+                theme_id = rest if end < 0 else rest[:end]
+                if theme_id:
+                    theme_ids.append(theme_id)
+        if not (
+            prefix == "experiment: "
+            or prefix.startswith("workflow: ")
+            or "/products/" in href.lower()
+        ):
+            filtered_links.append(link)
+    return filtered_links, theme_ids
+
+
+def _write_filtered_collection(
+    dest: Path,
+    project: Dict,
+    filtered_links: List[Dict],
+    source: Optional[Path] = None,
+) -> None:
+    # Nothing was filtered out, the source file can be reused as is
+    if source is not None and len(filtered_links) == len(project.get("links", [])):
+        copy_file(source, dest)
+        return
+    # new dict to avoid mutating caller's data
+    write_json(dest, {**project, "links": filtered_links})
+
+
+def write_project_collection(
+    dest: Path, project: Dict, source: Optional[Path] = None
+) -> None:
+    """Write a project's collection.json filtering out experiment/workflow links.
+
+    If ``source`` is the file ``project`` was loaded from and no link is
+    filtered out, it is copied to ``dest`` instead.
+    """
+    filtered_links, _ = _scan_project_links(project.get("links", []))
+    _write_filtered_collection(dest, project, filtered_links, source)
 
 
 def get_project_themes(project: Dict) -> List[str]:
     """Extract theme ids mentioned in a project links list."""
-    return [
-        link["href"].split("/themes/")[1].split("/")[0]
-        for link in project.get("links", [])
-        if "title" in link and "theme: " in link["title"].lower()
-    ]
+    return _scan_project_links(project.get("links", []))[1]
 
 
 def add_project_themes_to_dict(
-    themes: Dict[str, List[Dict]], ref: Dict, project: Dict
-) -> Dict[str, List[Dict]]:
+    themes: Dict[str, List[ProjectRef]], ref: ProjectRef, project: Dict
+) -> Dict[str, List[ProjectRef]]:
     """Add a project ref to all themes referenced by the project."""
     p_themes = get_project_themes(project)
     for theme in p_themes:
@@ -96,7 +337,7 @@ def add_project_themes_to_dict(
 
 
 def get_theme_links(
-    theme: Dict, projects: List[Dict]
+    theme: Dict, projects: List[ProjectRef]
 ) -> List[Dict]:
     """Build the links for a theme catalogue by appending child project links."""
     links = [
@@ -104,14 +345,12 @@ def get_theme_links(
         for link in theme.get("links", [])
         if link.get("rel") not in ("root", "child")
     ]
-    for project in projects:
+    for project_id, project_title in projects:
         links.append(
             {
                 "rel": "child",
-                "href": str(
-                    Path("../..") / "projects" / project["id"] / "collection.json"
-                ),
-                "title": project["title"],
+                "href": f"../../projects/{project_id}/collection.json",
+                "title": project_title,
             }
         )
     return links
@@ -123,15 +362,50 @@ def get_catalogue_links(catalogue: Dict) -> List[Dict]:
         link
         for link in catalogue.get("links", [])
         if link.get("rel") != "child"
-        or link.get("title", "").lower() in ["themes", "projects"]
+        or link.get("title", "").lower() in _KEEP_TOPLEVEL
     ]
 
 
+def _process_project(
+    projects_source: Path,
+    target: Path,
+    project: Dict,
+    license_to_keep: str,
+) -> Optional[Tuple[str, ProjectRef, List[str]]]:
+    """Filter and write a single project collection.
+
+    Returns (href, ref, theme_ids) for a kept project, or None if it was
+    skipped.
+    """
+    project_id = project["href"].split("/")[1]
+    collection = projects_source / project["href"]
+
+    if not collection.exists():
+        logger.warning("Missing project collection: %s", collection)
+        return None
+
+    data = load_json(collection)
+
+    # @TODO - Update condition for filtering on APEx projects!
+    if data.get("license", "").lower() == license_to_keep:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Skipping project: %s", project_id)
+        return None
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Copying project: %s", project_id)
+    dest = target / "projects" / project["href"]
+    filtered_links, theme_ids = _scan_project_links(data.get("links", []))
+    _write_filtered_collection(dest, data, filtered_links, collection)
+    ref = (project_id, data["title"])
+    return project["href"], ref, theme_ids
+
+
 def build_projects(
     projects_source: Path,
     target: Path,
     license_to_keep: str = LICENSE_TO_KEEP, # @TODO - Remove this!
-) -> Tuple[List[str], Dict[str, List[Dict]], Dict]:
+) -> Tuple[List[str], Dict[str, List[ProjectRef]], Dict]:
     """Build project collections by filtering based on the APEx condition
     and copy them to the target directory.
 
@@ -140,84 +414,108 @@ def build_projects(
     recreate_dir(target / "projects")
 
     catalog_path = projects_source / "catalog.json"
-    catalog = load_json(catalog_path)
 
     filtered_refs: List[str] = []
-    themes: Dict[str, List[Dict]] = {}
-
-    for project in [p for p in catalog.get("links", []) if p.get("rel") == "child"]:
-        project_id = project["href"].split("/")[1]
-        collection = projects_source / project["href"]
-
-        if not collection.exists():
-            logger.warning("Missing project collection: %s", collection)
-            continue
-
-        data = load_json(collection)
-
-        # @TODO - Update condition for filtering on APEx projects!
-        if data.get("license", "").lower() != license_to_keep:
-            logger.debug("Copying project: %s", project_id)
-            filtered_refs.append(project["href"])
-            dest = target / "projects" / project["href"]
-            write_project_collection(dest, data)
-            themes = add_project_themes_to_dict(
-                themes, {"id": project_id, "title": data["title"]}, data
-            )
-        else:
-            logger.debug("Skipping project: %s", project_id)
+    filtered_refs_set: Set[str] = set()
+    themes: Dict[str, List[ProjectRef]] = defaultdict(list)
+    filtered_catalogue: Dict = {}
+    # (href, link) pairs, the href is read once and reused when filtering
+    candidate_links: List[Tuple[str, Dict]] = []
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = []
+        submitted_refs: Set[str] = set()
+        for link in iter_catalog_links(catalog_path, filtered_catalogue):
+            rel = link.get("rel")
+            # A duplicated child link would otherwise be processed twice,
+            # concurrently, into the same destination
+            if rel == "child" and link["href"] not in submitted_refs:
+                submitted_refs.add(link["href"])
+                futures.append(
+                    ex.submit(
+                        _process_project,
+                        projects_source,
+                        target,
+                        link,
+                        license_to_keep,
+                    )
+                )
+            if rel != "root":
+                candidate_links.append((link.get("href"), link))
+
+        # Aggregate in submission order so the output stays deterministic
+        for future in futures:
+            result = future.result()
+            if result is None:
+                continue
+            href, ref, theme_ids = result
+            filtered_refs.append(href)
+            filtered_refs_set.add(href)
+            for theme in theme_ids:
+                themes[theme].append(ref)
 
     # Build filtered catalogue
-    filtered_catalogue = dict(catalog)
     filtered_catalogue["links"] = [
-        link
-        for link in catalog.get("links", [])
-        if link.get("rel") not in ["root"] and link.get("href") in filtered_refs
+        link for href, link in candidate_links if href in filtered_refs_set
     ]
 
     write_json(target / "projects" / "catalog.json", filtered_catalogue)
 
-    return filtered_refs, themes, filtered_catalogue
+    return filtered_refs, dict(themes), filtered_catalogue
 
 
 def build_themes(
-    themes: Dict[str, List[Dict]],
+    themes: Dict[str, List[ProjectRef]],
     themes_source: Path,
     target: Path,
+    pre_parsed_catalog: Optional[Dict] = None,
 ) -> None:
 
     themes_target = target / "themes"
     recreate_dir(themes_target)
 
-    catalog_path = themes_source / "catalog.json"
-    catalog = load_json(catalog_path)
+    if pre_parsed_catalog is None:
+        catalog = load_json(themes_source / "catalog.json")
+    else:
+        catalog = pre_parsed_catalog
 
     for theme_id, projects in themes.items():
-        logger.debug("Copying theme: %s", theme_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Copying theme: %s", theme_id)
         source = themes_source / theme_id
         dest = themes_target / theme_id
-        shutil.copytree(source, dest)
+        # catalog.json is rewritten below, only copy its sibling assets
+        _scandir_recursive(str(source), str(dest), skip=frozenset({"catalog.json"}))
 
-        theme = load_json(dest / "catalog.json")
+        theme = load_json(source / "catalog.json")
         theme["links"] = get_theme_links(theme, projects)
         write_json(dest / "catalog.json", theme)
 
     # Build filtered catalogue
+    theme_keys = frozenset(themes)
     filtered_catalogue = dict(catalog)
     filtered_catalogue["links"] = [
         link
         for link in catalog.get("links", [])
         if link.get("rel") not in ["root"]
-        and link.get("href").split("/")[1] in themes.keys()
+        and link.get("href").split("/")[1] in theme_keys
     ]
 
     write_json(themes_target / "catalog.json", filtered_catalogue)
 
 
-def build_main_catalogue(catalogue_source: Path, target: Path) -> None:
+def build_main_catalogue(
+    catalogue_source: Path,
+    target: Path,
+    pre_parsed_catalogue: Optional[Dict] = None,
+) -> None:
     catalogue_target = target / "catalog.json"
     logger.debug("Building the main catalog.json file")
-    catalogue = load_json(catalogue_source)
+    if pre_parsed_catalogue is None:
+        catalogue = load_json(catalogue_source)
+    else:
+        catalogue = dict(pre_parsed_catalogue)  # avoid mutating caller's data
     catalogue["title"] = "APEx Documentation Repository"
     catalogue["links"] = get_catalogue_links(catalogue)
     write_json(catalogue_target, catalogue)
@@ -234,12 +532,23 @@ def main(
 ) -> None:
 
     recreate_dir(target_base)
-    
+
     filtered_refs, themes, _ = build_projects(
         source_base / "projects", target_base, license_to_keep
     )
-    build_themes(themes, source_base / "themes", target_base)
-    build_main_catalogue(source_base / "catalog.json", target_base)
+    themes_source = source_base / "themes"
+    build_themes(
+        themes,
+        themes_source,
+        target_base,
+        pre_parsed_catalog=load_json(themes_source / "catalog.json"),
+    )
+    catalogue_source = source_base / "catalog.json"
+    build_main_catalogue(
+        catalogue_source,
+        target_base,
+        pre_parsed_catalogue=load_json(catalogue_source),
+    )
 
     logger.info(
         "Copied %i projects and %i themes", len(filtered_refs), len(themes.keys())
@@ -247,4 +556,6 @@ def main(
 
 
 if __name__ == "__main__":
+    # Verbose output for the sync workflow; importers configure their own level
+    logger.setLevel(logging.DEBUG)
     main()
@@ -1,6 +1,9 @@
 import json
 from pathlib import Path
 import importlib.util
+import shutil
+
+import pytest
 
 # Load the module directly from its file path so tests work regardless of
 # whether `scripts` is a package on sys.path.
@@ -12,6 +15,10 @@ fa = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(fa)
 
 
+def _ref_id(ref):
+    return ref[0]
+
+
 def test_get_project_themes():
     project = {
         "links": [
@@ -26,24 +33,24 @@ def test_get_project_themes():
 
 def test_add_project_themes_to_new_dict():
     themes = {}
-    ref = {"id": "project-1", "title": "Project One"}
+    ref = ("project-1", "Project One")
     project = {"links": [{"href": "/themes/atmosphere/", "title": "Theme: Atmosphere"}]}
     out = fa.add_project_themes_to_dict(themes, ref, project)
     assert "atmosphere" in out
-    assert out["atmosphere"][0]["id"] == "project-1"
+    assert _ref_id(out["atmosphere"][0]) == "project-1"
 
 
 def test_add_project_themes_to_existing_dict():
     refs = [
-        {"id": "project-1", "title": "Project One"},
-        {"id": "project-existing", "title": "Project Existing"},
+        ("project-1", "Project One"),
+        ("project-existing", "Project Existing"),
     ]
     themes = {"atmosphere": [refs[1]]}
 
     project = {"links": [{"href": "/themes/atmosphere/", "title": "Theme: Atmosphere"}]}
     out = fa.add_project_themes_to_dict(themes, refs[0], project)
     assert "atmosphere" in out
-    assert out["atmosphere"][0]["id"] == "project-existing"
+    assert _ref_id(out["atmosphere"][0]) == "project-existing"
 
 
 def test_write_project_collection_filters_links(tmp_path: Path):
@@ -75,6 +82,25 @@ def test_recreate_dir(tmp_path: Path):
     assert not any(d.iterdir())
 
 
+def test_recreate_dir_symlink(tmp_path: Path):
+    real = tmp_path / "real"
+    real.mkdir()
+    (real / "keep.txt").write_text("x")
+    link = tmp_path / "link"
+    link.symlink_to(real, target_is_directory=True)
+    with pytest.raises(OSError):
+        fa.recreate_dir(link)
+    assert (real / "keep.txt").exists()
+
+    # links inside the tree are removed without touching their target
+    d = tmp_path / "some_dir"
+    d.mkdir()
+    (d / "inner").symlink_to(real, target_is_directory=True)
+    fa.recreate_dir(d)
+    assert not any(d.iterdir())
+    assert (real / "keep.txt").exists()
+
+
 def test_get_theme_links():
     theme = {
         "links": [
@@ -82,7 +108,7 @@ def test_get_theme_links():
             {"rel": "related", "href": "/info", "title": "Info"},
         ]
     }
-    projects = [{"id": "project-1", "title": "Project One"}]
+    projects = [("project-1", "Project One")]
     links = fa.get_theme_links(theme, projects)
     # should include the related link and one child link
     rels = [l.get("rel") for l in links]
@@ -90,7 +116,7 @@ def test_get_theme_links():
     assert "child" in rels
     # child href should be under projects_target
     child = next(l for l in links if l["rel"] == "child")
-    assert child["href"] == str(Path("../..") / "projects" / "project-1" / "collection.json")
+    assert child["href"] == "../../projects/project-1/collection.json"
 
 
 def test_get_catalogue_links():
@@ -214,3 +240,205 @@ def test_build_full_catalogue(tmp_path: Path):
         l.get("rel") != "child" or l.get("title", "").lower() in ["themes", "projects"]
         for l in result["links"]
     )
+
+
+def test_build_projects_duplicate_child_link(tmp_path: Path):
+    projects_source = tmp_path / "projects"
+    (projects_source / "project-1").mkdir(parents=True)
+    child = {"rel": "child", "href": "./project-1/collection.json"}
+    (projects_source / "catalog.json").write_text(
+        json.dumps({"links": [child, child]})
+    )
+    source = projects_source / "project-1" / "collection.json"
+    p1 = {
+        "title": "P1",
+        "license": "public",
+        "links": [{"href": "/themes/land/", "title": "Theme: Land"}],
+    }
+    source.write_text(json.dumps(p1))
+
+    target = tmp_path / "catalog"
+    filtered_refs, themes, _ = fa.build_projects(projects_source, target)
+
+    assert filtered_refs == ["./project-1/collection.json"]
+    assert themes == {"land": [("project-1", "P1")]}
+    dest = target / "projects" / "project-1" / "collection.json"
+    assert json.loads(dest.read_text()) == p1
+    # the output must not share its inode with the source tree
+    assert not dest.samefile(source)
+
+
+def test_build_themes_copies_assets(tmp_path: Path):
+    themes_source = tmp_path / "themes"
+    land = themes_source / "land"
+    land.mkdir(parents=True)
+    (land / "EO_Land.webp").write_bytes(b"img")
+    (land / "catalog.json").write_text(
+        json.dumps({"title": "Land", "links": [{"rel": "root", "href": "/"}]})
+    )
+    (themes_source / "catalog.json").write_text(
+        json.dumps({"links": [{"rel": "child", "href": "./land/catalog.json"}]})
+    )
+
+    themes = {"land": [("project-1", "Project One")]}
+    fa.build_themes(themes, themes_source, tmp_path / "catalog")
+
+    dest = tmp_path / "catalog" / "themes" / "land"
+    assert (dest / "EO_Land.webp").read_bytes() == b"img"
+    data = json.loads((dest / "catalog.json").read_text())
+    assert [l["rel"] for l in data["links"]] == ["child"]
+
+
+def test_recreate_dir_nested(tmp_path: Path):
+    d = tmp_path / "some_dir"
+    (d / "a" / "b").mkdir(parents=True)
+    (d / "a" / "b" / "file").write_text("x")
+    (d / "a" / "file").write_text("x")
+    fa.recreate_dir(d)
+    assert d.is_dir()
+    assert not any(d.iterdir())
+
+
+def test_json_roundtrip_without_orjson(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(fa, "orjson", None)
+    path = tmp_path / "out" / "data.json"
+    data = {"title": "T", "links": [{"rel": "child", "href": "./a"}]}
+    fa.write_json(path, data)
+    assert fa.load_json(path) == data
+
+
+def test_load_json_returns_shallow_copies(tmp_path: Path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"links": [{"rel": "child"}]}))
+    first = fa.load_json(path)
+    first["links"] = [{"rel": "root"}]
+    first["title"] = "T"
+    assert fa.load_json(path) == {"links": [{"rel": "child"}]}
+
+
+def test_iter_catalog_links(tmp_path: Path):
+    path = tmp_path / "catalog.json"
+    catalog = {
+        "id": "projects",
+        "links": [{"rel": "root", "href": "/"}, {"rel": "child", "href": "./a"}],
+        "extent": {"spatial": {"bbox": [[-180.0, -90.0, 180.0, 90.0]]}},
+    }
+    path.write_text(json.dumps(catalog))
+    header = {}
+    links = list(fa.iter_catalog_links(path, header))
+    assert links == catalog["links"]
+    assert list(header) == ["id", "links", "extent"]
+    assert header["extent"] == catalog["extent"]
+
+
+def test_main(tmp_path: Path):
+    source = tmp_path / "open-science-catalog-metadata"
+    (source / "projects" / "project-1").mkdir(parents=True)
+    (source / "themes" / "land").mkdir(parents=True)
+    (source / "catalog.json").write_text(
+        json.dumps(
+            {
+                "title": "Orig",
+                "links": [
+                    {"rel": "child", "href": "./projects/catalog.json", "title": "Projects"},
+                    {"rel": "child", "href": "./other/catalog.json", "title": "Other"},
+                ],
+            }
+        )
+    )
+    (source / "projects" / "catalog.json").write_text(
+        json.dumps(
+            {"links": [{"rel": "child", "href": "./project-1/collection.json"}]}
+        )
+    )
+    (source / "projects" / "project-1" / "collection.json").write_text(
+        json.dumps(
+            {
+                "title": "P1",
+                "license": "public",
+                "links": [{"href": "../../themes/land/catalog.json", "title": "Theme: Land"}],
+            }
+        )
+    )
+    (source / "themes" / "catalog.json").write_text(
+        json.dumps({"links": [{"rel": "child", "href": "./land/catalog.json"}]})
+    )
+    (source / "themes" / "land" / "catalog.json").write_text(
+        json.dumps({"title": "Land", "links": []})
+    )
+
+    target = tmp_path / "catalog"
+    fa.main(source_base=source, target_base=target)
+
+    main_catalogue = json.loads((target / "catalog.json").read_text())
+    assert main_catalogue["title"] == "APEx Documentation Repository"
+    assert [l["title"] for l in main_catalogue["links"]] == ["Projects"]
+    themes_catalogue = json.loads((target / "themes" / "catalog.json").read_text())
+    assert [l["href"] for l in themes_catalogue["links"]] == ["./land/catalog.json"]
+    land = json.loads((target / "themes" / "land" / "catalog.json").read_text())
+    assert land["links"][0]["href"] == "../../projects/project-1/collection.json"
+
+    # a second run in the same process after the target was removed
+    shutil.rmtree(target)
+    fa.main(source_base=source, target_base=target)
+    assert (target / "projects" / "project-1" / "collection.json").exists()
+
+
+def test_write_json_after_recreate_dir(tmp_path: Path):
+    target = tmp_path / "catalog"
+    fa.write_json(target / "projects" / "catalog.json", {})
+    fa.recreate_dir(target)
+    # the cached parent was removed and must be created again
+    fa.write_json(target / "projects" / "catalog.json", {})
+    assert (target / "projects" / "catalog.json").exists()
+
+    # a tree removed outside recreate_dir must not leave stale entries
+    shutil.rmtree(target)
+    fa.write_json(target / "projects" / "catalog.json", {})
+    assert (target / "projects" / "catalog.json").exists()
+    shutil.rmtree(target)
+    source = tmp_path / "source.json"
+    source.write_text("{}")
+    fa.copy_file(source, target / "projects" / "collection.json")
+    assert (target / "projects" / "collection.json").exists()
+
+
+def test_write_project_collection_reuses_unfiltered_source(tmp_path: Path):
+    source = tmp_path / "source" / "collection.json"
+    source.parent.mkdir()
+    source.write_text('{"title": "P1", "links": [{"href": "/y"}]}')
+    dest = tmp_path / "projects" / "project-1" / "collection.json"
+    fa.write_project_collection(dest, fa.load_json(source), source)
+    assert dest.read_text() == source.read_text()
+
+
+def test_load_json_disk_cache(tmp_path: Path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("APEX_CACHE", "1")
+    monkeypatch.setattr(fa, "_CACHE_DIR", cache_dir)
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"title": "T"}))
+
+    assert fa.load_json(path) == {"title": "T"}
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    # a new process starts with an empty in-memory cache
+    fa._load_json_cached.cache_clear()
+    monkeypatch.setattr(fa, "_parse_json_file", None)
+    assert fa.load_json(path) == {"title": "T"}
+
+
+def test_load_json_disk_cache_failed_write(tmp_path: Path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("APEX_CACHE", "1")
+    monkeypatch.setenv("APEX_CACHE_DIR", str(cache_dir))
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"title": "T"}))
+
+    def _fail(src, dst):
+        raise OSError("boom")
+
+    monkeypatch.setattr(fa.os, "replace", _fail)
+    assert fa.load_json(path) == {"title": "T"}
+    # no temporary files are left behind
+    assert list(cache_dir.iterdir()) == []